@@ -1,131 +1,225 @@
 import gradio as gr
+import html
 import json
-from datetime import datetime
-from typing import List, Dict, Tuple
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Dict, Optional, Tuple
+
+_EMPTY_HTML = """
+    <div style="text-align: center; padding: 40px; color: #666;">
+        <h3>No todos yet!</h3>
+        <p>Add your first todo above to get started.</p>
+    </div>
+    """
+
+TODO_CSS = """
+    .todo-item {
+        display: flex;
+        align-items: center;
+        padding: 12px;
+        margin: 8px 0;
+        background: white;
+        border: 1px solid #e1e5e9;
+        border-radius: 6px;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    }
+    .todo-completed {
+        background: #f8f9fa;
+        opacity: 0.7;
+    }
+    .todo-text {
+        flex: 1;
+        margin: 0 12px;
+        font-size: 16px;
+    }
+    .todo-completed .todo-text {
+        text-decoration: line-through;
+        color: #6c757d;
+    }
+    .todo-actions {
+        display: flex;
+        gap: 8px;
+    }
+    .btn-small {
+        padding: 4px 8px;
+        font-size: 12px;
+        border: none;
+        border-radius: 4px;
+        cursor: pointer;
+    }
+    .btn-toggle {
+        background: #28a745;
+        color: white;
+    }
+    .btn-toggle.completed {
+        background: #6c757d;
+    }
+    .btn-delete {
+        background: #dc3545;
+        color: white;
+    }
+    .stats {
+        text-align: center;
+        margin: 20px 0;
+        padding: 15px;
+        background: #f8f9fa;
+        border-radius: 6px;
+    }
+"""
+
+_HEADER_HTML = """
+    <div style="max-width: 600px; margin: 0 auto;">
+    """
+
+_COMPLETED_CLASS = sys.intern("todo-completed")
+
+# Row markup split around the variable parts so rows are joined from
+# shared constants instead of formatted from scratch
+_ROW_OPEN_ACTIVE = sys.intern("""
+    <div class="todo-item ">
+        <div class="todo-text">""")
+_ROW_OPEN_DONE = sys.intern(f"""
+    <div class="todo-item {_COMPLETED_CLASS}">
+        <div class="todo-text">""")
+_ROW_MID = sys.intern("""</div>
+        <div class="todo-actions">
+            <span style="font-size: 12px; color: #6c757d;">""")
+_ROW_CLOSE = sys.intern("""</span>
+        </div>
+    </div>
+    """)
+
+@dataclass(slots=True)
+class Todo:
+    id: int
+    text: str
+    completed: bool
+    created_at: str
+    text_html: str = ""
 
 class TodoApp:
     def __init__(self):
         self.todos = []
+        self._by_id = {}
+        self._row_cache = {}
         self.next_id = 1
+        self._completed_count = 0
+        self._dirty = True
+        self._cached_html = ""
         
     def add_todo(self, text: str) -> Tuple[str, str]:
         """Add a new todo item"""
         if not text or text.strip() == "":
             return self.get_todos_display(), "Please enter a todo item"
         
-        todo = {
-            "id": self.next_id,
-            "text": text.strip(),
-            "completed": False,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        text = text.strip()
+        todo = Todo(
+            id=self.next_id,
+            text=text,
+            completed=False,
+            created_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+            text_html=html.escape(text),
+        )
         self.todos.append(todo)
+        self._by_id[todo.id] = todo
+        self._row_cache[todo.id] = self._render_row(todo)
+        self._dirty = True
         self.next_id += 1
         return self.get_todos_display(), ""
     
+    def _get(self, todo_id: int) -> Optional[Todo]:
+        """Look up a todo by id"""
+        return self._by_id.get(todo_id)
+    
     def toggle_todo(self, todo_id: int) -> str:
         """Toggle completion status of a todo"""
-        for todo in self.todos:
-            if todo["id"] == todo_id:
-                todo["completed"] = not todo["completed"]
-                break
+        todo = self._get(todo_id)
+        if todo is None:
+            return self.get_todos_display()
+        return self._toggle(todo)
+    
+    def _toggle(self, todo: Todo) -> str:
+        """Toggle completion status of a resolved todo"""
+        todo.completed = not todo.completed
+        self._completed_count += 1 if todo.completed else -1
+        self._row_cache[todo.id] = self._render_row(todo)
+        self._dirty = True
         return self.get_todos_display()
     
     def delete_todo(self, todo_id: int) -> str:
         """Delete a todo item"""
-        self.todos = [todo for todo in self.todos if todo["id"] != todo_id]
+        todo = self._get(todo_id)
+        if todo is None:
+            return self.get_todos_display()
+        return self._delete(todo)
+    
+    def _delete(self, todo: Todo) -> str:
+        """Delete a resolved todo"""
+        del self._by_id[todo.id]
+        del self._row_cache[todo.id]
+        self.todos.remove(todo)
+        if todo.completed:
+            self._completed_count -= 1
+        self._dirty = True
         return self.get_todos_display()
     
     def edit_todo(self, todo_id: int, new_text: str) -> str:
         """Edit a todo item"""
+        todo = self._get(todo_id)
+        if todo is None:
+            return self.get_todos_display()
+        return self._edit(todo, new_text)
+    
+    def _edit(self, todo: Todo, new_text: str) -> str:
+        """Edit a resolved todo"""
         if not new_text or new_text.strip() == "":
             return self.get_todos_display()
         
-        for todo in self.todos:
-            if todo["id"] == todo_id:
-                todo["text"] = new_text.strip()
-                break
+        todo.text = new_text.strip()
+        todo.text_html = html.escape(todo.text)
+        self._row_cache[todo.id] = self._render_row(todo)
+        self._dirty = True
         return self.get_todos_display()
     
     def clear_completed(self) -> str:
         """Remove all completed todos"""
-        self.todos = [todo for todo in self.todos if not todo["completed"]]
+        # Compact in place so no temporary list is allocated
+        todos = self.todos
+        write = 0
+        for todo in todos:
+            if todo.completed:
+                del self._by_id[todo.id]
+                del self._row_cache[todo.id]
+            else:
+                todos[write] = todo
+                write += 1
+        del todos[write:]
+        self._completed_count = 0
+        self._dirty = True
         return self.get_todos_display()
     
+    def _render_row(self, todo: Todo) -> str:
+        """Render the HTML fragment for a single todo"""
+        row_open = _ROW_OPEN_DONE if todo.completed else _ROW_OPEN_ACTIVE
+        return "".join((row_open, todo.text_html, _ROW_MID, todo.created_at, _ROW_CLOSE))
+    
     def get_todos_display(self) -> str:
         """Generate HTML display of todos"""
-        if not self.todos:
-            return """
-            <div style="text-align: center; padding: 40px; color: #666;">
-                <h3>No todos yet!</h3>
-                <p>Add your first todo above to get started.</p>
-            </div>
-            """
+        if not self._dirty:
+            return self._cached_html
+        self._dirty = False
         
-        html = """
-        <div style="max-width: 600px; margin: 0 auto;">
-            <style>
-                .todo-item {
-                    display: flex;
-                    align-items: center;
-                    padding: 12px;
-                    margin: 8px 0;
-                    background: white;
-                    border: 1px solid #e1e5e9;
-                    border-radius: 6px;
-                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                }
-                .todo-completed {
-                    background: #f8f9fa;
-                    opacity: 0.7;
-                }
-                .todo-text {
-                    flex: 1;
-                    margin: 0 12px;
-                    font-size: 16px;
-                }
-                .todo-completed .todo-text {
-                    text-decoration: line-through;
-                    color: #6c757d;
-                }
-                .todo-actions {
-                    display: flex;
-                    gap: 8px;
-                }
-                .btn-small {
-                    padding: 4px 8px;
-                    font-size: 12px;
-                    border: none;
-                    border-radius: 4px;
-                    cursor: pointer;
-                }
-                .btn-toggle {
-                    background: #28a745;
-                    color: white;
-                }
-                .btn-toggle.completed {
-                    background: #6c757d;
-                }
-                .btn-delete {
-                    background: #dc3545;
-                    color: white;
-                }
-                .stats {
-                    text-align: center;
-                    margin: 20px 0;
-                    padding: 15px;
-                    background: #f8f9fa;
-                    border-radius: 6px;
-                }
-            </style>
-        """
+        if not self.todos:
+            self._cached_html = _EMPTY_HTML
+            return self._cached_html
         
         # Add stats
         total = len(self.todos)
-        completed = sum(1 for todo in self.todos if todo["completed"])
+        completed = self._completed_count
         pending = total - completed
         
-        html += f"""
+        stats = f"""
             <div class="stats">
                 <strong>Total: {total}</strong> | 
                 <span style="color: #28a745;">Completed: {completed}</span> | 
@@ -133,27 +227,20 @@ class TodoApp:
             </div>
         """
         
-        # Add todos
-        for todo in self.todos:
-            completed_class = "todo-completed" if todo["completed"] else ""
-            toggle_text = "✓" if not todo["completed"] else "↶"
-            toggle_class = "completed" if todo["completed"] else ""
-            
-            html += f"""
-            <div class="todo-item {completed_class}">
-                <div class="todo-text">{todo["text"]}</div>
-                <div class="todo-actions">
-                    <span style="font-size: 12px; color: #6c757d;">{todo["created_at"]}</span>
-                </div>
-            </div>
-            """
-        
-        html += "</div>"
-        return html
+        # Add todos from the per-row cache
+        row_cache = self._row_cache
+        self._cached_html = "".join([
+            _HEADER_HTML,
+            stats,
+            *(row_cache[todo.id] for todo in self.todos),
+            "</div>",
+        ])
+        return self._cached_html
     
-    def get_todo_list_for_editing(self) -> List[Tuple[int, str, bool]]:
-        """Get todos in a format suitable for editing"""
-        return [(todo["id"], todo["text"], todo["completed"]) for todo in self.todos]
+    def get_todo_list_for_editing(self) -> Iterator[Tuple[int, str, bool]]:
+        """Yield todos in a format suitable for editing"""
+        for todo in self.todos:
+            yield todo.id, todo.text, todo.completed
 
 # Initialize the todo app
 todo_app = TodoApp()
@@ -162,21 +249,31 @@ def add_todo_handler(text):
     display, error = todo_app.add_todo(text)
     return display, "", error if error else "Todo added successfully!"
 
+def _lookup_todo(todo_id):
+    """Parse a Gradio id input and resolve it to a todo, or None if invalid"""
+    try:
+        return todo_app._get(int(todo_id))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
 def toggle_todo_handler(todo_id):
-    if todo_id is not None:
-        display = todo_app.toggle_todo(int(todo_id))
+    todo = _lookup_todo(todo_id)
+    if todo is not None:
+        display = todo_app._toggle(todo)
         return display, "Todo status updated!"
     return todo_app.get_todos_display(), "Please enter a valid todo ID"
 
 def delete_todo_handler(todo_id):
-    if todo_id is not None:
-        display = todo_app.delete_todo(int(todo_id))
+    todo = _lookup_todo(todo_id)
+    if todo is not None:
+        display = todo_app._delete(todo)
         return display, "Todo deleted!"
     return todo_app.get_todos_display(), "Please enter a valid todo ID"
 
 def edit_todo_handler(todo_id, new_text):
-    if todo_id is not None and new_text:
-        display = todo_app.edit_todo(int(todo_id), new_text)
+    todo = _lookup_todo(todo_id)
+    if todo is not None and new_text:
+        display = todo_app._edit(todo, new_text)
         return display, "", "Todo updated!"
     return todo_app.get_todos_display(), "", "Please enter valid todo ID and text"
 
@@ -185,7 +282,7 @@ def clear_completed_handler():
     return display, "Completed todos cleared!"
 
 # Create the Gradio interface
-with gr.Blocks(title="Todo List App", theme=gr.themes.Soft()) as app:
+with gr.Blocks(title="Todo List App", theme=gr.themes.Soft(), css=TODO_CSS) as app:
     gr.Markdown("# 📝 Todo List App")
     gr.Markdown("*A simple todo list built with Gradio*")
     